@@ -3,16 +3,129 @@ Colab-specific environment configuration for Pokemon Showdown Gym.
 
 This module provides optimized configurations and utilities for running
 the Pokemon Showdown environment in Google Colab.
+
+Import this module before numpy or torch: it limits the BLAS/OpenMP thread
+pools to one thread, which only takes effect if set before they initialise.
 """
 
 import os
+
+# Must run before numpy/torch are imported anywhere in the process
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+for _var in THREAD_ENV_VARS:
+    os.environ.setdefault(_var, "1")
+
+import functools
+import hashlib
+import importlib
+import platform
+import shlex
+import shutil
+import socket
 import subprocess
 import time
 import signal
-from typing import Optional, Dict, Any
-import numpy as np
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Optional, Dict, Any, List, Union
 from pathlib import Path
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# psutil's own exceptions (NoSuchProcess, AccessDenied) are not OSErrors
+PSUTIL_ERRORS = (psutil.Error,) if psutil is not None else ()
+
+
+# Shallow, single-branch clone: none of the cloned repositories need history
+GIT_CLONE = [
+    "git", "clone", "--depth=1", "--single-branch", "--no-tags", "--filter=blob:none"
+]
+
+# Mount point of Google Drive in Colab, used for caches that outlive a session
+DRIVE_PATH = "/content/drive/MyDrive"
+DRIVE_CACHE_PATH = f"{DRIVE_PATH}/.cache/showdown_gym"
+
+PIP_INSTALL = ["pip", "install", "--use-pep517", "--no-warn-script-location"]
+
+# Extra environment for setup commands: no pip self-update check, and more
+# concurrent registry connections for npm's many small package downloads
+SETUP_ENV = {
+    "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    "npm_config_maxsockets": "50",
+    "DEBIAN_FRONTEND": "noninteractive",
+}
+
+# apt-get update is skipped while the package lists are younger than this (seconds)
+APT_LISTS = "/var/lib/apt/lists"
+APT_UPDATE_STAMP = "/var/lib/apt/periodic/update-success-stamp"
+APT_LIST_MAX_AGE = 3600
+
+SHOWDOWN_REPO = "https://github.com/smogon/pokemon-showdown.git"
+
+# Amount of install log included in error messages
+LOG_TAIL_BYTES = 4096
+
+
+class InstallError(subprocess.CalledProcessError):
+    """A setup command failed; the message includes the tail of its log."""
+    
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.output:
+            message += f"\n--- install.log (tail) ---\n{self.output}"
+        return message
+
+
+def _tail(path: Path, size: int = LOG_TAIL_BYTES) -> str:
+    """Return the last ``size`` bytes of a file, decoded leniently."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - size, 0))
+        return f.read().decode("utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_available() -> bool:
+    """Probe CUDA once per process; importing torch is expensive."""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except (ImportError, OSError):
+        # OSError: torch is installed but its CUDA libraries fail to load
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _static_info() -> Dict[str, Any]:
+    """Environment information that cannot change during a session."""
+    return {
+        "platform": platform.platform(),
+        "python_version": platform.python_version(),
+        "cpu_count": psutil.cpu_count() if psutil else os.cpu_count(),
+        "gpu_available": _gpu_available()
+    }
+
+
+def _dynamic_info() -> Dict[str, Any]:
+    """Environment information that changes while the session runs."""
+    if psutil is None:
+        return {"memory_total": None, "memory_available": None, "disk_usage": None}
+    
+    memory = psutil.virtual_memory()
+    return {
+        "memory_total": memory.total,
+        "memory_available": memory.available,
+        "disk_usage": psutil.disk_usage('/').percent
+    }
+
 
 class ColabEnvironmentManager:
     """
@@ -25,18 +138,139 @@ class ColabEnvironmentManager:
     - Resource optimization for Colab
     """
     
-    def __init__(self, base_path: str = "/content"):
+    def __init__(self, base_path: str = "/content", install_extras: bool = True):
         """
         Initialize the Colab environment manager.
         
         Args:
             base_path: Base path for installations (default: /content for Colab)
+            install_extras: Whether setup also installs the optional README.md
+                packages (cares_reinforcement_learning, gymnasium_envrionments);
+                showdown_gym itself is always installed
         """
         self.base_path = Path(base_path)
+        self.install_extras = install_extras
         self.showdown_path = self.base_path / "pokemon-showdown"
         self.gym_path = self.base_path / "showdown_gym"
+        self.server_log = self.base_path / "showdown-server.log"
+        self.install_log = self.base_path / "install.log"
+        self.pid_file = self.base_path / ".showdown.pid"
         self.server_process: Optional[subprocess.Popen] = None
+        self._server_log_file: Optional[IO[bytes]] = None
+        self._reused_pid: Optional[int] = None
+    
+    def enable_caches(self) -> Path:
+        """
+        Point pip and npm at a persistent download cache.
+        
+        The cache lives on Google Drive when it is mounted, so downloads are
+        reused across Colab sessions; otherwise it falls back to base_path.
+        
+        Returns:
+            Path: The cache directory in use
+        """
+        if Path(DRIVE_PATH).exists():
+            cache_root = Path(DRIVE_CACHE_PATH)
+        else:
+            cache_root = self.base_path / ".cache"
+        
+        os.environ["PIP_CACHE_DIR"] = str(cache_root / "pip")
+        os.environ["npm_config_cache"] = str(cache_root / "npm")
+        
+        print(f"✅ Download caches enabled at {cache_root}")
+        return cache_root
+    
+    def _run_logged(self, args: Union[str, List[str]], cwd: Optional[Path] = None, shell: bool = False) -> None:
+        """
+        Run a command with its output appended to the install log.
+        
+        Output goes to a file rather than a pipe, so chatty installers are not
+        buffered in memory.
+        
+        Args:
+            args: Command to run (a shell script when ``shell`` is True)
+            cwd: Working directory for the command (default: base_path)
+            shell: Whether to run ``args`` through bash
+            
+        Raises:
+            InstallError: If the command fails; its message ends with the log tail
+        """
+        self.install_log.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.install_log, "ab") as log:
+            result = subprocess.run(
+                args,
+                shell=shell,
+                executable="/bin/bash" if shell else None,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                cwd=cwd or self.base_path,
+                env={**os.environ, **SETUP_ENV}
+            )
+        
+        if result.returncode != 0:
+            raise InstallError(result.returncode, args, _tail(self.install_log))
+    
+    def _run_chain(self, commands: List[List[str]], cwd: Optional[Path] = None) -> None:
+        """
+        Run a sequence of commands as a single ``&&``-joined shell invocation.
+        
+        Batching the commands into one shell spawns one process instead of one
+        per step. Every argument is quoted with ``shlex.quote``.
+        
+        Args:
+            commands: Commands to run in order, each as an argument list
+            cwd: Working directory for the shell (default: base_path)
+            
+        Raises:
+            InstallError: If any command in the chain fails
+        """
+        script = " && ".join(shlex.join(command) for command in commands)
+        self._run_logged(script, cwd=cwd, shell=True)
+        
+    @staticmethod
+    def _apt_lists_stale() -> bool:
+        """
+        Check whether the apt package lists need refreshing.
+        
+        Uses the age of the downloaded lists themselves (or apt's update
+        success stamp); pkgcache.bin is rebuilt on any dpkg change and so
+        says nothing about when the lists were last updated.
         
+        Returns:
+            bool: True if there are no package lists or they are older than APT_LIST_MAX_AGE
+        """
+        try:
+            with os.scandir(APT_LISTS) as entries:
+                lists = [entry for entry in entries if entry.is_file() and entry.name != "lock"]
+            if not lists:
+                return True
+            try:
+                updated = os.path.getmtime(APT_UPDATE_STAMP)
+            except OSError:
+                updated = max(entry.stat().st_mtime for entry in lists)
+        except OSError:
+            return True
+        return time.time() - updated > APT_LIST_MAX_AGE
+    
+    def _install_steps(self, apt_update: bool) -> List[List[str]]:
+        """
+        Build the system and Python package install commands.
+        
+        Args:
+            apt_update: Whether to refresh the apt package lists first
+            
+        Returns:
+            List[List[str]]: Commands for _run_chain
+        """
+        steps = []
+        if apt_update:
+            steps.append(["apt-get", "update", "-qq"])
+        steps.append([
+            "apt-get", "install", "-y", "-qq", "--no-install-recommends", "nodejs", "npm"
+        ])
+        steps.append(["pip", "install", "-q", "-r", "requirements-colab.txt"])
+        return steps
+    
     def install_dependencies(self) -> bool:
         """
         Install all required system and Python dependencies (following README.md).
@@ -45,19 +279,17 @@ class ColabEnvironmentManager:
             bool: True if installation successful, False otherwise
         """
         try:
-            # Install system dependencies
-            subprocess.run([
-                "apt-get", "update"
-            ], check=True, capture_output=True)
-            
-            subprocess.run([
-                "apt-get", "install", "-y", "nodejs", "npm"
-            ], check=True, capture_output=True)
-            
-            # Install Python packages (following README.md requirements)
-            subprocess.run([
-                "pip", "install", "-q", "-r", "requirements-colab.txt"
-            ], check=True, capture_output=True)
+            # Install system dependencies and Python packages (following
+            # README.md requirements) in a single shell invocation
+            apt_update = self._apt_lists_stale()
+            try:
+                self._run_chain(self._install_steps(apt_update), cwd=Path.cwd())
+            except subprocess.CalledProcessError:
+                if apt_update:
+                    raise
+                # The lists looked fresh but may not know the packages yet
+                print("⚠️  Install failed with cached package lists, retrying after apt-get update...")
+                self._run_chain(self._install_steps(apt_update=True), cwd=Path.cwd())
             
             print("✅ All dependencies installed successfully!")
             print("📝 Following README.md installation requirements")
@@ -71,56 +303,50 @@ class ColabEnvironmentManager:
         """
         Install additional dependencies mentioned in README.md (exact order).
         
+        showdown_gym itself is always installed; cares_reinforcement_learning
+        and gymnasium_envrionments are skipped when ``install_extras`` is False.
+        
         Returns:
             bool: True if installation successful, False otherwise
         """
         try:
-            # Step 1: cares_reinforcement_learning (README.md Step 1)
-            print("📦 Installing cares_reinforcement_learning (README.md Step 1)...")
             cares_path = self.base_path / "cares_reinforcement_learning"
-            if not cares_path.exists():
-                subprocess.run([
-                    "git", "clone", 
-                    "https://github.com/UoA-CARES/cares_reinforcement_learning.git"
-                ], check=True, cwd=self.base_path)
+            gym_path = self.base_path / "showdown_gym"
+            gym_env_path = self.base_path / "gymnasium_envrionments"
             
-            subprocess.run([
-                "pip", "install", "-r", "requirements.txt"
-            ], check=True, cwd=cares_path)
+            # Clone the independent repositories concurrently (network-bound)
+            repos = [("https://github.com/UoA-CARES/showdown_gym.git", gym_path)]
+            if self.install_extras:
+                repos += [
+                    ("https://github.com/UoA-CARES/cares_reinforcement_learning.git", cares_path),
+                    ("https://github.com/UoA-CARES/gymnasium_envrionments.git", gym_env_path),
+                ]
+            missing = [(url, dest) for url, dest in repos if not dest.exists()]
+            if missing:
+                print(f"📥 Cloning {len(missing)} repositories in parallel...")
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    # list() re-raises the first failing clone
+                    list(executor.map(
+                        lambda repo: self._run_logged([*GIT_CLONE, repo[0], str(repo[1])]),
+                        missing
+                    ))
             
-            subprocess.run([
-                "pip", "install", "-e", "."
-            ], check=True, cwd=cares_path)
+            # pip installs stay sequential - they share the same site-packages.
+            # Requirements and the editable package go into one pip call so
+            # the resolver only runs once per repository.
+            # Step 1: cares_reinforcement_learning (README.md Step 1)
+            if self.install_extras:
+                print("📦 Installing cares_reinforcement_learning (README.md Step 1)...")
+                self._run_logged(PIP_INSTALL + ["-r", "requirements.txt", "-e", "."], cwd=cares_path)
             
             # Step 2: showdown_gym (README.md Step 2 - primary package)
             print("📦 Installing showdown_gym (README.md Step 2 - primary package)...")
-            gym_path = self.base_path / "showdown_gym"
-            if not gym_path.exists():
-                subprocess.run([
-                    "git", "clone", 
-                    "https://github.com/UoA-CARES/showdown_gym.git"
-                ], check=True, cwd=self.base_path)
-            
-            subprocess.run([
-                "pip", "install", "-r", "requirements.txt"
-            ], check=True, cwd=gym_path)
-            
-            subprocess.run([
-                "pip", "install", "-e", "."
-            ], check=True, cwd=gym_path)
+            self._run_logged(PIP_INSTALL + ["-r", "requirements.txt", "-e", "."], cwd=gym_path)
             
             # Step 3: gymnasium_environments (README.md Step 3)
-            print("📦 Installing gymnasium_environments (README.md Step 3)...")
-            gym_env_path = self.base_path / "gymnasium_envrionments"
-            if not gym_env_path.exists():
-                subprocess.run([
-                    "git", "clone", 
-                    "https://github.com/UoA-CARES/gymnasium_envrionments.git"
-                ], check=True, cwd=self.base_path)
-            
-            subprocess.run([
-                "pip", "install", "-r", "requirements.txt"
-            ], check=True, cwd=gym_env_path)
+            if self.install_extras:
+                print("📦 Installing gymnasium_environments (README.md Step 3)...")
+                self._run_logged(PIP_INSTALL + ["-r", "requirements.txt"], cwd=gym_env_path)
             
             print("✅ All README.md dependencies installed!")
             print("📝 Following exact README.md package installation order")
@@ -131,6 +357,108 @@ class ColabEnvironmentManager:
             print(f"❌ Error installing additional dependencies: {e}")
             return False
     
+    def _showdown_snapshot(self) -> Optional[Path]:
+        """
+        Locate the Drive snapshot of a fully installed Pokemon Showdown tree.
+        
+        The snapshot is keyed by the upstream commit and the Node.js version,
+        the only inputs the clone and ``npm ci`` depend on.
+        
+        Returns:
+            Optional[Path]: Snapshot path (which may not exist yet), or None if
+            Drive is not mounted, zstd is missing or the key can't be computed
+        """
+        if not Path(DRIVE_PATH).exists() or shutil.which("zstd") is None:
+            return None
+        
+        try:
+            head = subprocess.run(
+                ["git", "ls-remote", SHOWDOWN_REPO, "HEAD"],
+                check=True, capture_output=True, text=True
+            ).stdout.split()[0]
+            node = subprocess.run(
+                ["node", "--version"], check=True, capture_output=True, text=True
+            ).stdout.strip()
+        except (subprocess.CalledProcessError, OSError, IndexError):
+            return None
+        
+        key = hashlib.sha256(f"{head}\n{node}".encode()).hexdigest()[:16]
+        return Path(DRIVE_CACHE_PATH) / f"showdown-{key}.tar.zst"
+    
+    @staticmethod
+    def _node_modules_current(lockfile: Path, node_modules: Path) -> bool:
+        """
+        Check whether node_modules was installed from the current lockfile.
+        
+        npm writes ``node_modules/.package-lock.json`` after every install, so
+        it is newer than ``package-lock.json`` unless the lockfile changed since.
+        
+        Args:
+            lockfile: The project's package-lock.json
+            node_modules: The project's node_modules directory
+            
+        Returns:
+            bool: True if the installed tree is up to date with the lockfile
+        """
+        try:
+            return os.path.getmtime(node_modules / ".package-lock.json") >= os.path.getmtime(lockfile)
+        except OSError:
+            return False
+    
+    def _restore_snapshot(self, snapshot: Path) -> bool:
+        """
+        Extract a Showdown snapshot into base_path.
+        
+        A failed extraction removes the partial tree so setup can fall back
+        to a fresh clone.
+        
+        Args:
+            snapshot: Archive produced by _save_snapshot
+            
+        Returns:
+            bool: True if the snapshot was extracted, False otherwise
+        """
+        try:
+            self._run_logged(["tar", "--zstd", "-xf", str(snapshot)])
+            return True
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"⚠️  Could not restore Pokemon Showdown snapshot, cloning instead: {e}")
+            shutil.rmtree(self.showdown_path, ignore_errors=True)
+            return False
+    
+    def _save_snapshot(self, snapshot: Path) -> None:
+        """
+        Archive the installed Showdown tree for later sessions.
+        
+        The key follows upstream HEAD, so older snapshots would rarely match
+        again; only the newest one is kept. The snapshot is only a cache, so
+        failures (e.g. Drive full) are reported and otherwise ignored.
+        
+        Args:
+            snapshot: Destination archive path
+        """
+        partial = snapshot.with_name(snapshot.name + ".partial")
+        try:
+            snapshot.parent.mkdir(parents=True, exist_ok=True)
+            self._run_logged([
+                "tar", "-I", "zstd -3", "-cf", str(partial), self.showdown_path.name
+            ])
+            os.replace(partial, snapshot)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"⚠️  Could not save Pokemon Showdown snapshot: {e}")
+            try:
+                partial.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+        
+        for old in snapshot.parent.glob("showdown-*.tar.zst"):
+            if old != snapshot:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+    
     def setup_showdown_server(self) -> bool:
         """
         Clone and configure the Pokemon Showdown server (following README.md instructions).
@@ -139,26 +467,49 @@ class ColabEnvironmentManager:
             bool: True if setup successful, False otherwise
         """
         try:
+            config_src = self.showdown_path / "config" / "config-example.js"
+            config_dst = self.showdown_path / "config" / "config.js"
+            
+            # Restore a previous session's install from Drive when available
+            snapshot = None
+            if not self.showdown_path.exists():
+                snapshot = self._showdown_snapshot()
+                if snapshot is not None and snapshot.exists() and self._restore_snapshot(snapshot):
+                    print(f"✅ Pokemon Showdown restored from {snapshot}")
+                    return True
+            
             # Clone Pokemon Showdown if not exists (following README.md)
             if not self.showdown_path.exists():
-                subprocess.run([
-                    "git", "clone", 
-                    "https://github.com/smogon/pokemon-showdown.git"
-                ], check=True, cwd=self.base_path)
+                self._run_logged([
+                    *GIT_CLONE,
+                    SHOWDOWN_REPO,
+                    str(self.showdown_path)
+                ])
             
-            # Install Node.js dependencies (as per README.md)
-            subprocess.run([
-                "npm", "install"
-            ], check=True, cwd=self.showdown_path)
+            # Install Node.js dependencies (as per README.md). npm ci installs
+            # straight from the lockfile but always wipes node_modules, so it
+            # is only used for a tree that has none yet; an install that is
+            # already current with the lockfile is skipped entirely
+            npm_flags = ["--prefer-offline", "--no-audit", "--no-fund", "--silent", "--no-progress"]
+            lockfile = self.showdown_path / "package-lock.json"
+            node_modules = self.showdown_path / "node_modules"
+            steps = []
+            if not self._node_modules_current(lockfile, node_modules):
+                if lockfile.exists() and not node_modules.exists():
+                    steps.append(["npm", "ci", *npm_flags])
+                else:
+                    steps.append(["npm", "install", *npm_flags])
             
             # Copy configuration (following README.md instructions)
-            config_src = self.showdown_path / "config" / "config-example.js"
-            config_dst = self.showdown_path / "config" / "config.js"
-            
             if config_src.exists() and not config_dst.exists():
-                subprocess.run([
-                    "cp", str(config_src), str(config_dst)
-                ], check=True)
+                steps.append(["cp", str(config_src), str(config_dst)])
+            
+            if steps:
+                self._run_chain(steps, cwd=self.showdown_path)
+            
+            # Snapshot the fresh install so later sessions can skip clone + npm
+            if snapshot is not None:
+                self._save_snapshot(snapshot)
             
             print("✅ Pokemon Showdown server setup complete!")
             print("📝 Following README.md installation instructions")
@@ -168,60 +519,255 @@ class ColabEnvironmentManager:
             print(f"❌ Error setting up Pokemon Showdown server: {e}")
             return False
     
-    def start_server(self, port: int = 8000) -> bool:
+    @staticmethod
+    def _port_open(port: int, host: str = "127.0.0.1") -> bool:
+        """
+        Check whether a TCP server is accepting connections on the given port.
+        
+        Args:
+            port: Port number to probe
+            host: Host to connect to
+            
+        Returns:
+            bool: True if a connection could be established, False otherwise
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            return sock.connect_ex((host, port)) == 0
+    
+    @staticmethod
+    def _server_fingerprint(pid: int) -> Optional[str]:
+        """
+        Identify a running Pokemon Showdown server process.
+        
+        Args:
+            pid: PID to inspect
+            
+        Returns:
+            Optional[str]: The process start time if ``pid`` is alive and is
+            running pokemon-showdown, None otherwise
+        """
+        try:
+            if psutil is not None:
+                proc = psutil.Process(pid)
+                cmdline = proc.cmdline()
+                started = f"{proc.create_time():.2f}"
+            else:
+                cmdline = Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace").split("\0")
+                # Field 22 of /proc/<pid>/stat (start time in clock ticks)
+                started = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[19]
+        except (OSError, ValueError, IndexError, *PSUTIL_ERRORS):
+            return None
+        
+        if not any("pokemon-showdown" in arg for arg in cmdline):
+            return None
+        return started
+    
+    def _recorded_server_pid(self) -> Optional[int]:
+        """
+        Read the PID of a previously started server from the PID file.
+        
+        The file stores the PID with the process start time, so a PID that has
+        since been reused by an unrelated process is not mistaken for the
+        server. A stale file is removed.
+        
+        Returns:
+            Optional[int]: The PID if it still belongs to the recorded server
+        """
+        try:
+            pid_text, fingerprint = self.pid_file.read_text().split()
+            pid = int(pid_text)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self.pid_file.unlink(missing_ok=True)
+            return None
+        
+        if self._server_fingerprint(pid) != fingerprint:
+            self.pid_file.unlink(missing_ok=True)
+            return None
+        return pid
+    
+    def start_server(self, port: int = 8000, startup_timeout: float = 30.0, reuse: bool = False) -> bool:
         """
         Start the Pokemon Showdown server in the background.
         
         Args:
             port: Port number for the server
+            startup_timeout: Seconds to wait for the server to accept connections
+            reuse: Reuse a server recorded in the PID file (e.g. from before a
+                notebook reload) if it is alive and listening on ``port``
             
         Returns:
             bool: True if server started successfully, False otherwise
         """
         try:
+            if reuse:
+                pid = self._recorded_server_pid()
+                if pid is not None and self._port_open(port):
+                    if self.server_process is None or self.server_process.pid != pid:
+                        self._reused_pid = pid
+                    print(f"♻️  Reusing Pokemon Showdown server (PID {pid}) on port {port}")
+                    return True
+            
             # Kill existing server if running
-            self.stop_server()
+            self.stop_server(force=True)
             
-            # Start new server
+            # Anything still listening is not ours; our server would fail to
+            # bind and the readiness poll below would be fooled by the listener
+            if self._port_open(port):
+                print(f"❌ Port {port} is already in use by another process")
+                return False
+            
+            # Start new server, logging to a file so a full pipe can't block it
+            self._server_log_file = open(self.server_log, "ab")
             self.server_process = subprocess.Popen([
                 "node", "pokemon-showdown", "start", "--no-security", f"--port={port}"
             ], 
             cwd=self.showdown_path,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            preexec_fn=os.setsid
+            stdout=self._server_log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
             )
             
-            # Wait for server to start
-            time.sleep(5)
+            # Poll until the server accepts connections, bailing out if it exits
+            deadline = time.monotonic() + startup_timeout
+            while time.monotonic() < deadline:
+                if self.server_process.poll() is not None:
+                    print("❌ Failed to start Pokemon Showdown server")
+                    return False
+                if self._port_open(port) and self.server_process.poll() is None:
+                    # Only record a server that is confirmed running pokemon-showdown
+                    pid = self.server_process.pid
+                    fingerprint = self._server_fingerprint(pid)
+                    if fingerprint is None or self.server_process.poll() is not None:
+                        print("❌ Pokemon Showdown server exited during startup")
+                        self.stop_server()
+                        return False
+                    self.pid_file.write_text(f"{pid} {fingerprint}\n")
+                    print(f"✅ Pokemon Showdown server started on port {port}!")
+                    return True
+                time.sleep(0.1)
             
-            # Check if server is running
-            if self.server_process.poll() is None:
-                print(f"✅ Pokemon Showdown server started on port {port}!")
-                return True
-            else:
-                print("❌ Failed to start Pokemon Showdown server")
-                return False
+            print(f"❌ Pokemon Showdown server did not open port {port} within {startup_timeout}s")
+            self.stop_server()
+            return False
                 
         except Exception as e:
             print(f"❌ Error starting server: {e}")
             return False
     
-    def stop_server(self) -> None:
+    def stop_server(self, term_timeout: float = 5.0, force: bool = False) -> None:
         """
         Stop the Pokemon Showdown server.
+        
+        Sends SIGTERM to the server's process group and escalates to SIGKILL
+        if it has not exited within ``term_timeout`` seconds. A server that
+        was reused from the PID file is only stopped when ``force`` is set.
+        
+        Args:
+            term_timeout: Seconds to wait after SIGTERM before sending SIGKILL
+            force: Also stop a server recorded in the PID file
         """
-        if self.server_process and self.server_process.poll() is None:
+        if force:
+            pid = self._recorded_server_pid()
+            own_pid = self.server_process.pid if self.server_process else None
+            if pid is not None and pid != own_pid:
+                self._stop_process_group(pid, term_timeout)
+            self.pid_file.unlink(missing_ok=True)
+            self._reused_pid = None
+        
+        process = self.server_process
+        if process is None:
+            return
+        
+        try:
+            if process.poll() is None:
+                self._stop_process_group(process.pid, term_timeout, process)
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        finally:
+            for stream in (process.stdout, process.stderr, self._server_log_file):
+                if stream is not None:
+                    stream.close()
+            self._server_log_file = None
+            self.server_process = None
+            self.pid_file.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _stop_process_group(
+        pid: int, term_timeout: float, process: Optional[subprocess.Popen] = None
+    ) -> None:
+        """
+        Terminate a server process and its children, escalating to SIGKILL.
+        
+        Args:
+            pid: PID of the server process
+            term_timeout: Seconds to wait after SIGTERM before sending SIGKILL
+            process: Popen handle when the server is our own child, so it can
+                be reaped while waiting instead of lingering as a zombie
+        """
+        if psutil is None:
+            # Without psutil, signal the session's process group directly
             try:
-                os.killpg(os.getpgid(self.server_process.pid), signal.SIGTERM)
-                self.server_process.wait(timeout=5)
-            except (ProcessLookupError, subprocess.TimeoutExpired):
-                try:
-                    os.killpg(os.getpgid(self.server_process.pid), signal.SIGKILL)
-                except ProcessLookupError:
-                    pass
-            finally:
-                self.server_process = None
+                pgid = os.getpgid(pid)
+                os.killpg(pgid, signal.SIGTERM)
+                if process is not None:
+                    try:
+                        process.wait(timeout=term_timeout)
+                    except subprocess.TimeoutExpired:
+                        pass
+                else:
+                    deadline = time.monotonic() + term_timeout
+                    while time.monotonic() < deadline:
+                        os.kill(pid, 0)
+                        time.sleep(0.1)
+                # Clears any group members still running after the leader exits
+                os.killpg(pgid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            return
+        
+        try:
+            parent = psutil.Process(pid)
+            procs = [parent] + parent.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return
+        
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        
+        _, alive = psutil.wait_procs(procs, timeout=term_timeout)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(alive, timeout=2)
+    
+    def _import_wrapper(self) -> type:
+        """
+        Import SingleShowdownWrapper, falling back to the cloned checkout.
+        
+        showdown_gym is normally pip-installed by install_additional_dependencies;
+        gym_path is only added to sys.path (once) when that import fails.
+        
+        Returns:
+            type: The SingleShowdownWrapper class
+        """
+        try:
+            from showdown_gym.showdown_environment import SingleShowdownWrapper
+        except ImportError:
+            gym_path = str(self.gym_path)
+            if gym_path not in sys.path:
+                sys.path.insert(0, gym_path)
+                importlib.invalidate_caches()
+            from showdown_gym.showdown_environment import SingleShowdownWrapper
+        return SingleShowdownWrapper
     
     def test_environment(self) -> Dict[str, Any]:
         """
@@ -242,12 +788,11 @@ class ColabEnvironmentManager:
             # Test server connection
             if self.server_process and self.server_process.poll() is None:
                 results["server_running"] = True
+            elif self._reused_pid is not None and self._recorded_server_pid() == self._reused_pid:
+                results["server_running"] = True
             
             # Test environment import and creation
-            import sys
-            sys.path.append(str(self.gym_path))
-            
-            from showdown_gym.showdown_environment import SingleShowdownWrapper
+            SingleShowdownWrapper = self._import_wrapper()
             
             # Create test environment
             env = SingleShowdownWrapper(team_type="random", opponent_type="random")
@@ -276,10 +821,18 @@ class ColabEnvironmentManager:
         """
         Apply optimizations for Google Colab environment.
         """
-        # Set environment variables for better performance
-        os.environ["OMP_NUM_THREADS"] = "1"
-        os.environ["MKL_NUM_THREADS"] = "1"
-        os.environ["NUMEXPR_NUM_THREADS"] = "1"
+        # Set environment variables for better performance (already applied
+        # at import time; repeated so subprocesses always inherit them)
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = "1"
+        
+        # Skip npm's network lookups for audit reports and funding notices
+        os.environ["npm_config_audit"] = "false"
+        os.environ["npm_config_fund"] = "false"
+        
+        # Thread pools of an already-imported torch ignore the env vars
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(1)
         
         # Configure matplotlib for Colab
         import matplotlib
@@ -294,45 +847,39 @@ class ColabEnvironmentManager:
         Returns:
             Dict containing environment information
         """
-        import platform
-        import psutil
-        
-        return {
-            "platform": platform.platform(),
-            "python_version": platform.python_version(),
-            "cpu_count": psutil.cpu_count(),
-            "memory_total": psutil.virtual_memory().total,
-            "memory_available": psutil.virtual_memory().available,
-            "disk_usage": psutil.disk_usage('/').percent,
-            "gpu_available": self._check_gpu_availability()
-        }
+        return {**_static_info(), **_dynamic_info()}
     
     def _check_gpu_availability(self) -> bool:
         """
         Check if GPU is available in the Colab environment.
         
+        The result is memoized per process, so torch is imported at most once.
+        
         Returns:
             bool: True if GPU is available, False otherwise
         """
-        try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
-            return False
+        return _gpu_available()
 
 
-def setup_colab_environment() -> ColabEnvironmentManager:
+def setup_colab_environment(install_extras: bool = True) -> ColabEnvironmentManager:
     """
     Convenience function to set up the complete Colab environment (following README.md).
     
+    Args:
+        install_extras: Whether to install the optional README.md packages
+            (showdown_gym itself is always installed)
+    
     Returns:
         ColabEnvironmentManager: Configured environment manager
     """
-    manager = ColabEnvironmentManager()
+    manager = ColabEnvironmentManager(install_extras=install_extras)
     
     print("🚀 Setting up Pokemon Showdown Gym for Google Colab...")
     print("📝 Following README.md installation instructions")
     
+    # Reuse pip/npm downloads from previous sessions
+    manager.enable_caches()
+    
     # Install dependencies
     if not manager.install_dependencies():
         raise RuntimeError("Failed to install dependencies")
@@ -346,7 +893,7 @@ def setup_colab_environment() -> ColabEnvironmentManager:
         raise RuntimeError("Failed to setup Pokemon Showdown server")
     
     # Start server
-    if not manager.start_server():
+    if not manager.start_server(reuse=True):
         raise RuntimeError("Failed to start Pokemon Showdown server")
     
     # Apply Colab optimizations
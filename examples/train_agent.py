@@ -2,23 +2,46 @@
 Example training script for Pokemon Showdown Gym.
 """
 
+import math
+import os
 import sys
+import time
 sys.path.append('.')
 
+import numpy as np
 from showdown_gym.showdown_environment import SingleShowdownWrapper
 from stable_baselines3 import DQN
-from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import SubprocVecEnv, VecMonitor
 import matplotlib.pyplot as plt
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
-def train_agent():
-    """Train a DQN agent on the Pokemon Showdown environment."""
+
+def make_env(rank: int, n_envs: int, team_type: str = "random", opponent_type: str = "random"):
+    """Return a factory for the rank-th of n_envs environments of a vectorized env."""
+    
+    def _init():
+        # SingleShowdownWrapper names its accounts after the current second, so
+        # each worker waits for a second congruent to its rank modulo n_envs.
+        # Workers then never share a second, however long their imports took.
+        now = time.time()
+        target = math.floor(now) + 1
+        target += (rank - target) % n_envs
+        time.sleep(target - now + 0.1)
+        return SingleShowdownWrapper(team_type=team_type, opponent_type=opponent_type)
     
-    # Create environment
-    def make_env():
-        return SingleShowdownWrapper(team_type="random", opponent_type="random")
+    return _init
+
+
+def train_agent(n_envs: int = 8):
+    """Train a DQN agent on the Pokemon Showdown environment."""
     
-    env = make_vec_env(make_env, n_envs=1)
+    # Create environments - battles are IO-bound on the server round-trip,
+    # so several can run concurrently against the same local server
+    env = VecMonitor(SubprocVecEnv([make_env(rank, n_envs) for rank in range(n_envs)]))
     
     # Create DQN agent
     model = DQN(
@@ -26,9 +49,9 @@ def train_agent():
         env,
         verbose=1,
         learning_rate=0.001,
-        buffer_size=10000,
+        buffer_size=100_000,
         learning_starts=1000,
-        batch_size=32
+        batch_size=256
     )
     
     # Train the agent
@@ -42,40 +65,51 @@ def train_agent():
     return model
 
 
-def evaluate_agent(model_path: str = "pokemon_dqn_model"):
-    """Evaluate the trained agent."""
+def evaluate_agent(model_path: str = "pokemon_dqn_model", n_episodes: int = 10, n_envs: int | None = None):
+    """Evaluate the trained agent, running episodes in parallel environments."""
     
     # Load the model
     model = DQN.load(model_path)
     
-    # Create evaluation environment
-    env = SingleShowdownWrapper(team_type="random", opponent_type="max")
+    # Create evaluation environments - one batched forward pass serves them all
+    if n_envs is None:
+        physical = psutil.cpu_count(logical=False) if psutil is not None else None
+        n_envs = physical or os.cpu_count() or 1
+    n_envs = max(1, min(n_envs, n_episodes))
+    env = SubprocVecEnv([make_env(rank, n_envs, opponent_type="max") for rank in range(n_envs)])
     
-    # Run evaluation
+    # Run evaluation; finished environments are reset automatically by the VecEnv.
+    # Each env gets a fixed episode quota (as in SB3's evaluate_policy) so quick
+    # battles can't crowd out long ones in the results.
     obs = env.reset()
-    total_reward = 0
+    episode_rewards = np.zeros(n_envs)
+    episode_counts = np.zeros(n_envs, dtype=int)
+    episode_targets = np.array([(n_episodes + i) // n_envs for i in range(n_envs)], dtype=int)
+    completed_rewards = []
     wins = 0
     
-    for episode in range(10):
-        obs = env.reset()
-        done = False
-        episode_reward = 0
-        
-        while not done:
-            action, _ = model.predict(obs, deterministic=True)
-            obs, reward, done, info = env.step(action)
-            episode_reward += reward
-        
-        total_reward += episode_reward
+    while (episode_counts < episode_targets).any():
+        actions, _ = model.predict(obs, deterministic=True)
+        obs, rewards, dones, infos = env.step(actions)
+        episode_rewards += rewards
         
-        if 'win' in info and info['win']:
-            wins += 1
-        
-        print(f"Episode {episode + 1}: Reward = {episode_reward:.2f}")
+        for i in np.flatnonzero(dones):
+            if episode_counts[i] < episode_targets[i]:
+                episode_counts[i] += 1
+                completed_rewards.append(episode_rewards[i])
+                
+                if infos[i].get('win'):
+                    wins += 1
+                
+                print(f"Episode {len(completed_rewards)}: Reward = {episode_rewards[i]:.2f}")
+            episode_rewards[i] = 0
+    
+    env.close()
     
+    total_reward = np.sum(completed_rewards)
     print(f"\nEvaluation Results:")
-    print(f"Average Reward: {total_reward / 10:.2f}")
-    print(f"Win Rate: {wins / 10 * 100:.1f}% ({wins}/10)")
+    print(f"Average Reward: {total_reward / n_episodes:.2f}")
+    print(f"Win Rate: {wins / n_episodes * 100:.1f}% ({wins}/{n_episodes})")
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ with open("requirements.txt", "r", encoding="utf-8") as fh:
 setup(
     name="showdown_gym",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(include=["showdown_gym*"]),
     python_requires=">=3.10",
     install_requires=requirements,
     extras_require={
@@ -0,0 +1,67 @@
+"""
+Shared fixtures for Pokemon Showdown Gym tests.
+
+Building a SingleShowdownWrapper creates players and loads team files, so
+each distinct (team_type, opponent_type) pair is built once per module and
+shared by every fixture that asks for it.
+"""
+
+import time
+
+import pytest
+from showdown_gym.showdown_environment import SingleShowdownWrapper
+
+# Second (as %H%M%S) in which the last environment was built
+_last_built = None
+
+
+@pytest.fixture(scope="module")
+def env_cache():
+    """Environments built in this module, one per (team_type, opponent_type)."""
+    envs = {}
+    yield envs
+    for env in envs.values():
+        env.close()
+
+
+def _get_env(envs, team_type: str, opponent_type: str):
+    global _last_built
+    key = (team_type, opponent_type)
+    if key not in envs:
+        # SingleShowdownWrapper names its accounts after the current second,
+        # so never build two environments within the same one
+        while time.strftime("%H%M%S") == _last_built:
+            time.sleep(0.05)
+        envs[key] = SingleShowdownWrapper(team_type=team_type, opponent_type=opponent_type)
+        _last_built = time.strftime("%H%M%S")
+    return envs[key]
+
+
+@pytest.fixture(scope="module")
+def random_env(env_cache):
+    """Environment with a random team against a random opponent."""
+    return _get_env(env_cache, "random", "random")
+
+
+@pytest.fixture(scope="module", params=["random", "simple", "max"])
+def opponent_type(request):
+    """Opponent type under test, exposed so tests can report it."""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def opponent_env(env_cache, opponent_type):
+    """Environment with a random team against each opponent type."""
+    return _get_env(env_cache, "random", opponent_type)
+
+
+@pytest.fixture(scope="module", params=["random", "nu", "ou", "ru", "uu", "uber"])
+def team_type(request):
+    """Team type under test, exposed so tests can report it."""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def team_env(env_cache, team_type):
+    """Environment with each team type against a random opponent."""
+    return _get_env(env_cache, team_type, "random")
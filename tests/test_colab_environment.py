@@ -0,0 +1,126 @@
+"""
+Tests for the Colab setup helpers that only touch the filesystem.
+
+These need neither a Pokemon Showdown server nor Colab.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import colab_environment
+from colab_environment import ColabEnvironmentManager
+
+
+@pytest.fixture
+def apt_lists(tmp_path, monkeypatch):
+    """Point the apt list and stamp paths into a temporary directory."""
+    lists = tmp_path / "lists"
+    lists.mkdir()
+    monkeypatch.setattr(colab_environment, "APT_LISTS", str(lists))
+    monkeypatch.setattr(colab_environment, "APT_UPDATE_STAMP", str(tmp_path / "update-success-stamp"))
+    return lists
+
+
+def _age(path, seconds):
+    """Backdate a file's mtime by the given number of seconds."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_apt_lists_empty_is_stale(apt_lists):
+    """A lists directory with only the lock and partial/ counts as never updated."""
+    (apt_lists / "lock").touch()
+    (apt_lists / "partial").mkdir()
+    assert ColabEnvironmentManager._apt_lists_stale()
+
+
+def test_apt_lists_missing_is_stale(apt_lists):
+    """A missing lists directory counts as never updated."""
+    apt_lists.rmdir()
+    assert ColabEnvironmentManager._apt_lists_stale()
+
+
+def test_apt_lists_fresh_files(apt_lists):
+    """Recently downloaded list files are fresh, old ones are stale."""
+    list_file = apt_lists / "archive.ubuntu.com_ubuntu_dists_jammy_InRelease"
+    list_file.touch()
+    assert not ColabEnvironmentManager._apt_lists_stale()
+
+    _age(list_file, colab_environment.APT_LIST_MAX_AGE + 60)
+    assert ColabEnvironmentManager._apt_lists_stale()
+
+
+def test_apt_update_stamp_takes_precedence(apt_lists, tmp_path):
+    """The update success stamp decides freshness when present."""
+    list_file = apt_lists / "archive.ubuntu.com_ubuntu_dists_jammy_InRelease"
+    list_file.touch()
+    _age(list_file, colab_environment.APT_LIST_MAX_AGE + 60)
+    stamp = tmp_path / "update-success-stamp"
+    stamp.touch()
+    assert not ColabEnvironmentManager._apt_lists_stale()
+
+    _age(stamp, colab_environment.APT_LIST_MAX_AGE + 60)
+    os.utime(list_file)
+    assert ColabEnvironmentManager._apt_lists_stale()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Environment manager rooted in a temporary directory."""
+    return ColabEnvironmentManager(base_path=str(tmp_path))
+
+
+@pytest.mark.parametrize("content", ["", "garbage\n", "123\n", "abc 1.00\n", "1 2 3\n"])
+def test_malformed_pid_file_is_removed(manager, content):
+    """A PID file that can't be parsed is discarded."""
+    manager.pid_file.write_text(content)
+    assert manager._recorded_server_pid() is None
+    assert not manager.pid_file.exists()
+
+
+def test_recycled_pid_is_removed(manager):
+    """A PID now used by an unrelated process is not treated as the server."""
+    manager.pid_file.write_text(f"{os.getpid()} 1.00\n")
+    assert manager._recorded_server_pid() is None
+    assert not manager.pid_file.exists()
+
+
+def test_fingerprint_mismatch_is_removed(manager, monkeypatch):
+    """A server restarted under the same PID has a different start time."""
+    monkeypatch.setattr(ColabEnvironmentManager, "_server_fingerprint", staticmethod(lambda pid: "200.00"))
+    manager.pid_file.write_text("4242 100.00\n")
+    assert manager._recorded_server_pid() is None
+    assert not manager.pid_file.exists()
+
+
+def test_matching_fingerprint_is_kept(manager, monkeypatch):
+    """The recorded server is returned and its PID file left in place."""
+    monkeypatch.setattr(ColabEnvironmentManager, "_server_fingerprint", staticmethod(lambda pid: "100.00"))
+    manager.pid_file.write_text("4242 100.00\n")
+    assert manager._recorded_server_pid() == 4242
+    assert manager.pid_file.exists()
+
+
+def test_server_fingerprint_requires_showdown():
+    """Only a process running pokemon-showdown has a fingerprint."""
+    assert ColabEnvironmentManager._server_fingerprint(os.getpid()) is None
+
+    server = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(30)", "pokemon-showdown"]
+    )
+    try:
+        # The command line is only populated once the child has exec'd
+        deadline = time.monotonic() + 5
+        fingerprint = None
+        while fingerprint is None and time.monotonic() < deadline:
+            fingerprint = ColabEnvironmentManager._server_fingerprint(server.pid)
+            time.sleep(0.01)
+        assert fingerprint is not None
+        assert ColabEnvironmentManager._server_fingerprint(server.pid) == fingerprint
+    finally:
+        server.kill()
+        server.wait()
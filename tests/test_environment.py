@@ -4,18 +4,19 @@ Basic tests for Pokemon Showdown Gym.
 
 import pytest
 import numpy as np
+import logging
 import os
-from showdown_gym.showdown_environment import SingleShowdownWrapper
 
+logger = logging.getLogger("showdown_gym.tests")
 
-def test_environment_creation():
+
+def test_environment_creation(random_env):
     """Test that environment can be created."""
     try:
-        env = SingleShowdownWrapper(team_type="random", opponent_type="random")
-        assert env is not None
-        print("✅ Environment creation test passed")
+        assert random_env is not None
+        logger.debug("Environment creation test passed")
     except Exception as e:
-        print(f"❌ Environment creation test failed: {e}")
+        logger.error("Environment creation test failed: %s", e)
         raise
 
 
@@ -23,28 +24,26 @@ def test_environment_creation():
     os.getenv("CI") == "true", 
     reason="Requires Pokemon Showdown server - skip in CI"
 )
-def test_environment_reset():
+def test_environment_reset(random_env):
     """Test environment reset functionality."""
     try:
-        env = SingleShowdownWrapper(team_type="random", opponent_type="random")
-        obs = env.reset()
+        obs = random_env.reset()
         assert obs is not None
         assert isinstance(obs, np.ndarray)
-        print("✅ Environment reset test passed")
+        logger.debug("Environment reset test passed")
     except Exception as e:
-        print(f"❌ Environment reset test failed: {e}")
+        logger.error("Environment reset test failed: %s", e)
         raise
 
 
-def test_action_space():
+def test_action_space(random_env):
     """Test action space functionality."""
     try:
-        env = SingleShowdownWrapper(team_type="random", opponent_type="random")
-        action = env.action_space.sample()
+        action = random_env.action_space.sample()
         assert isinstance(action, (int, np.integer))
-        print("✅ Action space test passed")
+        logger.debug("Action space test passed")
     except Exception as e:
-        print(f"❌ Action space test failed: {e}")
+        logger.error("Action space test failed: %s", e)
         raise
 
 
@@ -53,15 +52,12 @@ def test_environment_import():
     try:
         from showdown_gym.showdown_environment import ShowdownEnvironment, SingleShowdownWrapper
         from showdown_gym.base_environment import BaseShowdownEnv
-        print("✅ All imports successful")
+        logger.debug("All imports successful")
     except ImportError as e:
-        print(f"❌ Import failed: {e}")
+        logger.error("Import failed: %s", e)
         raise
 
 
 if __name__ == "__main__":
-    test_environment_creation()
-    test_environment_reset()
-    test_action_space()
-    test_environment_import()
-    print("🎉 All tests passed!")
+    # Fixtures come from conftest.py, so run through pytest
+    raise SystemExit(pytest.main([__file__]))
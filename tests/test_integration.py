@@ -7,30 +7,30 @@ They are skipped in CI environments.
 
 import pytest
 import numpy as np
+import logging
 import os
-from showdown_gym.showdown_environment import SingleShowdownWrapper
+
+logger = logging.getLogger("showdown_gym.tests")
 
 
 @pytest.mark.skipif(
     os.getenv("CI") == "true", 
     reason="Requires Pokemon Showdown server - skip in CI"
 )
-def test_full_environment_workflow():
+def test_full_environment_workflow(random_env):
     """Test complete environment workflow with server."""
+    env = random_env
     try:
-        # Create environment
-        env = SingleShowdownWrapper(team_type="random", opponent_type="random")
-        
         # Test reset
         obs = env.reset()
         assert obs is not None
         assert isinstance(obs, np.ndarray)
-        print("✅ Environment reset successful")
+        logger.debug("Environment reset successful")
         
         # Test action space
         action = env.action_space.sample()
         assert isinstance(action, (int, np.integer))
-        print("✅ Action space test passed")
+        logger.debug("Action space test passed")
         
         # Test step
         obs, reward, done, info = env.step(action)
@@ -38,13 +38,13 @@ def test_full_environment_workflow():
         assert isinstance(reward, (int, float))
         assert isinstance(done, bool)
         assert isinstance(info, dict)
-        print("✅ Environment step successful")
+        logger.debug("Environment step successful")
         
-        print("✅ Full environment workflow test passed")
+        logger.debug("Full environment workflow test passed")
         
     except Exception as e:
-        print(f"❌ Full environment workflow test failed: {e}")
-        print("Make sure Pokemon Showdown server is running on localhost:8000")
+        logger.error("Full environment workflow test failed: %s", e)
+        logger.error("Make sure Pokemon Showdown server is running on localhost:8000")
         raise
 
 
@@ -52,46 +52,36 @@ def test_full_environment_workflow():
     os.getenv("CI") == "true", 
     reason="Requires Pokemon Showdown server - skip in CI"
 )
-def test_environment_with_different_opponents():
+def test_environment_with_different_opponents(opponent_type, opponent_env):
     """Test environment with different opponent types."""
-    opponent_types = ["random", "simple", "max"]
-    
-    for opponent_type in opponent_types:
-        try:
-            env = SingleShowdownWrapper(team_type="random", opponent_type=opponent_type)
-            obs = env.reset()
-            assert obs is not None
-            print(f"✅ Environment with {opponent_type} opponent works")
-        except Exception as e:
-            print(f"❌ Environment with {opponent_type} opponent failed: {e}")
-            raise
+    try:
+        obs = opponent_env.reset()
+        assert obs is not None
+        logger.debug("Environment with opponent %s works", opponent_type)
+    except Exception as e:
+        logger.error("Environment with opponent %s failed: %s", opponent_type, e)
+        raise
 
 
 @pytest.mark.skipif(
     os.getenv("CI") == "true", 
     reason="Requires Pokemon Showdown server - skip in CI"
 )
-def test_environment_with_different_teams():
+def test_environment_with_different_teams(team_type, team_env):
     """Test environment with different team types."""
-    team_types = ["random", "nu", "ou", "ru", "uu", "uber"]
-    
-    for team_type in team_types:
-        try:
-            env = SingleShowdownWrapper(team_type=team_type, opponent_type="random")
-            obs = env.reset()
-            assert obs is not None
-            print(f"✅ Environment with {team_type} team works")
-        except Exception as e:
-            print(f"❌ Environment with {team_type} team failed: {e}")
-            raise
+    try:
+        obs = team_env.reset()
+        assert obs is not None
+        logger.debug("Environment with team %s works", team_type)
+    except Exception as e:
+        logger.error("Environment with team %s failed: %s", team_type, e)
+        raise
 
 
 if __name__ == "__main__":
     # Only run if not in CI
     if os.getenv("CI") != "true":
-        test_full_environment_workflow()
-        test_environment_with_different_opponents()
-        test_environment_with_different_teams()
-        print("🎉 All integration tests passed!")
+        # Fixtures come from conftest.py, so run through pytest
+        raise SystemExit(pytest.main([__file__]))
     else:
         print("⏭️  Skipping integration tests in CI environment")
@@ -0,0 +1,78 @@
+"""
+Tests for the README badge injection in setup_colab.py.
+"""
+
+import os
+
+import pytest
+
+import setup_colab
+from setup_colab import BADGE_MARKER, README_HEAD_BYTES, update_readme
+
+BADGE = b"colab-badge"
+
+
+@pytest.fixture
+def readme(tmp_path, monkeypatch):
+    """Run update_readme against a README.md in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "README.md"
+
+
+def test_badge_added_once(readme):
+    """A README without the badge gets it appended exactly once."""
+    readme.write_bytes(b"# Showdown Gym\n")
+    update_readme()
+    update_readme()
+    assert readme.read_bytes().count(BADGE) == 1
+
+
+def test_badge_split_across_head_window(readme):
+    """A badge straddling the head window boundary is still found."""
+    split = README_HEAD_BYTES - len(BADGE) // 2
+    content = b"x" * split + BADGE + b"\n" + b"y" * 100
+    readme.write_bytes(content)
+    update_readme()
+    assert readme.read_bytes() == content
+
+
+def test_badge_beyond_head_window(readme):
+    """A badge far past the head window is still found."""
+    content = b"x" * (3 * README_HEAD_BYTES) + BADGE + b"\n"
+    readme.write_bytes(content)
+    update_readme()
+    assert readme.read_bytes() == content
+
+
+def test_changed_readme_is_rescanned(readme):
+    """Replacing the README after the marker was written brings the badge back."""
+    readme.write_bytes(b"# Showdown Gym\n")
+    update_readme()
+    assert BADGE_MARKER.exists()
+
+    readme.write_bytes(b"# Regenerated README\n")
+    update_readme()
+    assert readme.read_bytes().count(BADGE) == 1
+
+
+def test_unchanged_readme_skips_scan(readme, monkeypatch):
+    """With a matching marker the README is not read again."""
+    readme.write_bytes(b"# Showdown Gym\n")
+    update_readme()
+
+    real_open = setup_colab.Path.open
+
+    def guarded_open(path, *args, **kwargs):
+        if path.name == "README.md":
+            raise AssertionError("README was rescanned")
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(setup_colab.Path, "open", guarded_open)
+    update_readme()
+
+
+def test_missing_readme_writes_no_marker(readme):
+    """Without a README nothing is written."""
+    update_readme()
+    assert not readme.exists()
+    assert not os.path.lexists(BADGE_MARKER)